@@ -4,7 +4,6 @@ Main bot of stormbot
 import asyncio
 import argparse
 import shlex
-import re
 import logging
 import pkg_resources
 import traceback
@@ -20,6 +19,8 @@ from slixmpp.xmlstream.matcher.xpath import MatchXPath
 from distutils.version import LooseVersion
 import ssl
 
+from .router import Router
+
 logger = logging.getLogger(__name__)
 
 class Plugin(metaclass=ABCMeta):
@@ -46,10 +47,23 @@ class Plugin(metaclass=ABCMeta):
         """Try to handle a message that couldn't be parsed"""
         return False
 
+    def fallback_routes(self, router):
+        """Register patterns of messages that couldn't be parsed to handle
+
+        Callbacks return True when they handled the message. By default every
+        message is given to fallback() if the plugin overrides it.
+        """
+        if type(self).fallback is not Plugin.fallback:
+            router.prefix("", lambda stanza, match: self.fallback(stanza, match.string))
+
     def message(self, nick, msg):
         """Handle a message directed to another nick"""
         pass
 
+    def message_routes(self, router):
+        """Register patterns of messages not directed to stormbot to handle"""
+        pass
+
 class Helper(Plugin):
     """Print help"""
     def cmdparser(self, parser):
@@ -197,6 +211,8 @@ class StormBot(ClientXMPP):
         self.plugins_cls = [Helper, Version] + (plugins or [])
         self.plugins = []
         self.subscriptions = {}
+        self.router = Router()
+        self.fallback_router = Router()
         self.ssl_version = ssl.PROTOCOL_TLS
         self._peers = {}
 
@@ -231,6 +247,8 @@ class StormBot(ClientXMPP):
             for dep in plugin.dependencies:
                 self.register_plugin(dep)
             plugin.cmdparser(subparsers)
+            plugin.message_routes(self.router)
+            plugin.fallback_routes(self.fallback_router)
 
             try:
                 distribution = pkg_resources.get_distribution(plugin.__class__.__module__)
@@ -261,9 +279,9 @@ class StormBot(ClientXMPP):
                     await self._command(msg)
                 except CommandParserError as parser_error:
                     body = msg['body'][len(self.nick + ':'):]
-                    for plugin in self.plugins:
+                    for callback, match in self.fallback_router.match(body):
                         try:
-                            if plugin.fallback(msg, body):
+                            if callback(msg, match):
                                 break
                         except Exception as e:
                             logger.exception(e)
@@ -274,14 +292,9 @@ class StormBot(ClientXMPP):
                     self.write("Are you trying to drive me insane?")
                     logger.exception(e)
             else:
-                match = re.search("^([^ :]+):", msg['body'])
-                if match is None:
-                    return
-
-                nick = match.group(1)
-                for plugin in self.subscriptions.get(nick, []):
+                for callback, match in self.router.match(msg['body']):
                     try:
-                        plugin.message(nick, msg)
+                        callback(msg, match)
                     except Exception as e:
                         self.write(e.message)
 
@@ -303,6 +316,7 @@ class StormBot(ClientXMPP):
         if nick not in self.subscriptions:
             self.subscriptions[nick] = []
         self.subscriptions[nick].append(plugin)
+        self.router.nick(nick, lambda msg, match: plugin.message(nick, msg))
 
     async def _handle_peer(self, presence):
         nick = presence['muc']['nick']
@@ -0,0 +1,131 @@
+"""
+Logging helpers of stormbot
+"""
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+
+def _report(handlers, msg, *args):
+    record = logging.LogRecord(__name__, logging.WARNING, __file__, 0, msg, args, None)
+    for handler in handlers:
+        handler.handle(record)
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler dropping records instead of blocking when queue is full"""
+    def __init__(self, maxsize=1024):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record):
+        # Only merge message arguments, formatting is left to the listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+
+class QueueListener(logging.handlers.QueueListener):
+    """Queue listener waiting for room in the queue to stop"""
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class QueueLogging:
+    """Format and write log records from a listener thread
+
+    Records are put on a bounded queue by the logging thread and handled by
+    the given handlers from a dedicated thread. When the queue is full,
+    records are dropped and counted.
+    """
+    def __init__(self, handlers, maxsize=1024):
+        self.handler = QueueHandler(maxsize)
+        self._handlers = handlers
+        self._listener = QueueListener(self.handler.queue, *handlers,
+                                       respect_handler_level=True)
+
+    @property
+    def dropped(self):
+        return self.handler.dropped
+
+    def start(self):
+        self._listener.start()
+
+    def stop(self):
+        """Flush pending records and report dropped ones"""
+        self._listener.stop()
+        if self.dropped > 0:
+            _report(self._handlers, "Dropped %d log records", self.dropped)
+
+
+class RateLimitFilter(logging.Filter):
+    """Let at most `rate` records per `period` seconds from the same call site
+
+    Records of `level` and above are never limited.
+    """
+    def __init__(self, rate, period=1.0, level=logging.WARNING):
+        super().__init__()
+        self.rate = rate
+        self.period = period
+        self.level = level
+        self.suppressed = 0
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= self.level:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            start, count = self._windows.get(key, (now, 0))
+            if now - start >= self.period:
+                start, count = now, 0
+            if count >= self.rate:
+                self.suppressed += 1
+                return False
+            self._windows[key] = (start, count + 1)
+        return True
+
+    def report(self, handler):
+        """Report suppressed records to handler"""
+        if self.suppressed > 0:
+            _report([handler], "Suppressed %d log records", self.suppressed)
+
+
+class JsonFormatter(logging.Formatter):
+    """Log formatter writing one JSON object per record"""
+    def format(self, record):
+        output = {
+            "time": record.created,
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            output["exception"] = record.exc_text
+        if record.stack_info:
+            output["stack"] = self.formatStack(record.stack_info)
+
+        return json.dumps(output)
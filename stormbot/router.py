@@ -0,0 +1,118 @@
+"""
+Message router of stormbot
+"""
+import re
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+
+def _mergeable(regex):
+    """Check if regex keeps its meaning once combined with other regexes
+
+    Group references and conditional groups depend on group numbers, and
+    global inline flags apply to the whole pattern they end up in.
+    """
+    if regex.flags & ~re.UNICODE:
+        return False
+
+    stack = [sre_parse.parse(regex.pattern)]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, sre_parse.SubPattern):
+            for op, av in value:
+                if op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+                    return False
+                stack.append(av)
+        elif isinstance(value, (tuple, list)):
+            stack.extend(value)
+    return True
+
+
+class Router:
+    """Dispatch messages to the callbacks registered for matching patterns
+
+    Nicks are looked up in a dict. Consecutive prefixes and regexes are
+    compiled into a single regex, whose matched alternative points directly at
+    the first matching route. Matching resumes after that route with the
+    regex combining the following ones.
+
+    A message matching no route costs one pass per group of combined routes
+    (a single one unless some regexes can't be combined, see `_mergeable`),
+    plus one pass per matching route. Catch-all routes, such as the default
+    ones of plugins overriding `Plugin.fallback`, match every message.
+
+    Callbacks are called with the message and the match object of their route,
+    the matched text being available as `match.string`.
+    """
+    _nick_re = re.compile("^([^ :]+):")
+
+    def __init__(self):
+        self._nicks = {}
+        self._routes = []
+        self._matchers = {}
+
+    def nick(self, nick, callback):
+        """Route messages addressed to nick (`nick: ...`)"""
+        self._nicks.setdefault(nick, []).append(callback)
+
+    def prefix(self, prefix, callback):
+        """Route messages starting with prefix"""
+        self.regex(re.escape(prefix), callback)
+
+    def regex(self, pattern, callback):
+        """Route messages matching pattern from their beginning"""
+        regex = re.compile(pattern)
+        self._routes.append((regex, callback, _mergeable(regex)))
+        self._matchers = {}
+
+    def _matcher(self, start):
+        """Combine routes from start up to the first one that can't be"""
+        if start not in self._matchers:
+            group = 1
+            alternatives = []
+            groups = {}
+            names = set()
+            for index, (regex, _, mergeable) in enumerate(self._routes[start:], start):
+                if not mergeable or names.intersection(regex.groupindex):
+                    break
+                names.update(regex.groupindex)
+                alternatives.append(f"({regex.pattern})")
+                groups[group] = index
+                group += regex.groups + 1
+
+            end = start + len(alternatives)
+            self._matchers[start] = (re.compile("|".join(alternatives)), groups, end)
+
+        return self._matchers[start]
+
+    def match(self, body):
+        """Iterate over callbacks matching body with their match object
+
+        Callbacks are yielded in registration order, nicks first.
+        """
+        match = self._nick_re.search(body)
+        if match is not None:
+            for callback in self._nicks.get(match.group(1), []):
+                yield callback, match
+
+        index = 0
+        while index < len(self._routes):
+            regex, callback, mergeable = self._routes[index]
+            if mergeable:
+                matcher, groups, end = self._matcher(index)
+                match = matcher.match(body)
+                if match is None:
+                    index = end
+                    continue
+                index = groups[match.lastindex]
+                regex, callback, _ = self._routes[index]
+
+            match = regex.match(body)
+            if match is not None:
+                yield callback, match
+            index += 1
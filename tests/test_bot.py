@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+
+from stormbot import mock
+from stormbot.bot import Plugin, StormBot
+from unittest.mock import MagicMock, Mock
+
+class Subscriber(Plugin):
+    def __init__(self, bot, args=None):
+        super().__init__(bot, args)
+        self.message = Mock()
+        bot.subscribe("alice", self)
+
+    def cmdparser(self, parser):
+        pass
+
+
+class Fallback(Plugin):
+    handled = True
+
+    def __init__(self, bot, args=None):
+        super().__init__(bot, args)
+        self.bodies = []
+
+    def cmdparser(self, parser):
+        pass
+
+    def fallback(self, stanza, msg):
+        self.bodies.append(msg)
+        return self.handled
+
+
+class Unhandled(Fallback):
+    handled = False
+
+
+class TestStormBot(unittest.TestCase):
+    def receive(self, bot, body, mucnick="bob"):
+        msg = {'mucnick': mucnick, 'body': body}
+        asyncio.get_event_loop().run_until_complete(bot._muc_message(msg))
+        return msg
+
+    def test_subscribe(self):
+        # Given
+        bot = mock.bot(Subscriber)
+        plugin = bot.plugins[-1]
+
+        # When
+        msg = self.receive(bot, "alice: hello")
+        self.receive(bot, "carol: hello")
+
+        # Then
+        plugin.message.assert_called_once_with("alice", msg)
+        self.assertEqual(bot.subscriptions, {"alice": [plugin]})
+
+    def test_fallback(self):
+        # Given
+        args = MagicMock()
+        args.jid = 'stormbot@example.org'
+        args.room = 'room@conference.example.org/stormbot'
+        bot = StormBot(args, '', [Fallback, Fallback])
+        bot.send_message = Mock()
+        first, second = bot.plugins[-2:]
+
+        # When
+        self.receive(bot, "stormbot: unknown command")
+
+        # Then
+        self.assertEqual(first.bodies, [" unknown command"])
+        self.assertEqual(second.bodies, [])
+        bot.send_message.assert_not_called()
+
+    def test_fallback_unhandled(self):
+        # Given
+        bot = mock.bot(Unhandled)
+        plugin = bot.plugins[-1]
+
+        # When
+        self.receive(bot, "stormbot: unknown command")
+
+        # Then
+        self.assertEqual(plugin.bodies, [" unknown command"])
+        self.assertEqual(bot.send_message.call_count, 2)
@@ -0,0 +1,147 @@
+import json
+import logging
+import time
+import unittest
+
+from stormbot.log import QueueHandler, QueueLogging, RateLimitFilter, JsonFormatter
+from unittest.mock import patch
+
+class TestQueueHandler(unittest.TestCase):
+    def test_drop_when_full(self):
+        # Given
+        handler = QueueHandler(maxsize=2)
+        record = logging.makeLogRecord({'msg': "message"})
+
+        # When
+        for _ in range(5):
+            handler.handle(record)
+
+        # Then
+        self.assertEqual(handler.queue.qsize(), 2)
+        self.assertEqual(handler.dropped, 3)
+
+    def test_prepare_merge_args(self):
+        # Given
+        handler = QueueHandler()
+        record = logging.makeLogRecord({'msg': "hello %s", 'args': ("world",)})
+
+        # When
+        handler.handle(record)
+
+        # Then
+        queued = handler.queue.get_nowait()
+        self.assertEqual(queued.msg, "hello world")
+        self.assertIsNone(queued.args)
+
+
+class TestQueueLogging(unittest.TestCase):
+    def test_stop_flush_records(self):
+        # Given
+        records = []
+        target = logging.Handler()
+        target.emit = records.append
+        queue_logging = QueueLogging([target])
+
+        # When
+        queue_logging.start()
+        queue_logging.handler.handle(logging.makeLogRecord({'msg': "message", 'levelno': logging.INFO}))
+        queue_logging.stop()
+
+        # Then
+        self.assertEqual([record.getMessage() for record in records], ["message"])
+
+    def test_stop_full_queue(self):
+        # Given
+        records = []
+        target = logging.Handler()
+        target.emit = lambda record: (time.sleep(0.01), records.append(record))
+        queue_logging = QueueLogging([target], maxsize=4)
+
+        # When
+        queue_logging.start()
+        for _ in range(50):
+            queue_logging.handler.handle(logging.makeLogRecord({'msg': "message",
+                                                                'levelno': logging.INFO}))
+        queue_logging.stop()
+
+        # Then
+        self.assertGreater(queue_logging.dropped, 0)
+        self.assertEqual(len(records), 50 - queue_logging.dropped + 1)
+        self.assertEqual(records[-1].getMessage(), f"Dropped {queue_logging.dropped} log records")
+
+
+class TestRateLimitFilter(unittest.TestCase):
+    @patch('stormbot.log.time.monotonic')
+    def test_rate_limit(self, monotonic):
+        # Given
+        monotonic.return_value = 0
+        ratelimit = RateLimitFilter(2)
+        record = logging.makeLogRecord({'pathname': "bot.py", 'lineno': 1,
+                                         'levelno': logging.DEBUG})
+
+        # When
+        passed = [ratelimit.filter(record) for _ in range(3)]
+        monotonic.return_value = 1
+        passed.append(ratelimit.filter(record))
+
+        # Then
+        self.assertEqual(passed, [True, True, False, True])
+        self.assertEqual(ratelimit.suppressed, 1)
+
+    @patch('stormbot.log.time.monotonic', lambda: 0)
+    def test_rate_limit_per_call_site(self):
+        # Given
+        ratelimit = RateLimitFilter(1)
+        first = logging.makeLogRecord({'pathname': "bot.py", 'lineno': 1, 'levelno': logging.DEBUG})
+        second = logging.makeLogRecord({'pathname': "bot.py", 'lineno': 2, 'levelno': logging.DEBUG})
+
+        # When
+        passed = [ratelimit.filter(first), ratelimit.filter(second)]
+
+        # Then
+        self.assertEqual(passed, [True, True])
+
+    @patch('stormbot.log.time.monotonic', lambda: 0)
+    def test_rate_limit_ignore_warnings(self):
+        # Given
+        ratelimit = RateLimitFilter(1)
+        record = logging.makeLogRecord({'pathname': "bot.py", 'lineno': 1, 'levelno': logging.ERROR})
+
+        # When
+        passed = [ratelimit.filter(record) for _ in range(3)]
+
+        # Then
+        self.assertEqual(passed, [True, True, True])
+        self.assertEqual(ratelimit.suppressed, 0)
+
+    @patch('stormbot.log.time.monotonic', lambda: 0)
+    def test_report_suppressed(self):
+        # Given
+        records = []
+        target = logging.Handler()
+        target.emit = records.append
+        ratelimit = RateLimitFilter(1)
+        record = logging.makeLogRecord({'pathname': "bot.py", 'lineno': 1, 'levelno': logging.DEBUG})
+        for _ in range(3):
+            ratelimit.filter(record)
+
+        # When
+        ratelimit.report(target)
+
+        # Then
+        self.assertEqual([record.getMessage() for record in records], ["Suppressed 2 log records"])
+
+
+class TestJsonFormatter(unittest.TestCase):
+    def test_format(self):
+        # Given
+        record = logging.makeLogRecord({'name': "stormbot.bot", 'levelname': "DEBUG",
+                                        'msg': "hello %s", 'args': ("world",)})
+
+        # When
+        output = json.loads(JsonFormatter().format(record))
+
+        # Then
+        self.assertEqual(output['name'], "stormbot.bot")
+        self.assertEqual(output['level'], "DEBUG")
+        self.assertEqual(output['message'], "hello world")
@@ -0,0 +1,106 @@
+import unittest
+
+from stormbot.router import Router
+from unittest.mock import Mock
+
+class TestRouter(unittest.TestCase):
+    def test_nick(self):
+        # Given
+        router = Router()
+        first, second, other = Mock(), Mock(), Mock()
+        router.nick("alice", first)
+        router.nick("alice", second)
+        router.nick("bob", other)
+
+        # When
+        callbacks = [callback for callback, _ in router.match("alice: hello")]
+
+        # Then
+        self.assertEqual(callbacks, [first, second])
+
+    def test_no_match(self):
+        # Given
+        router = Router()
+        router.nick("alice", Mock())
+        router.prefix("!", Mock())
+        router.regex("[0-9]+", Mock())
+
+        # When
+        matches = list(router.match("hello"))
+
+        # Then
+        self.assertEqual(matches, [])
+
+    def test_first_match_and_following(self):
+        # Given
+        router = Router()
+        callbacks = [Mock() for _ in range(4)]
+        router.prefix("!", callbacks[0])
+        router.regex("(?P<number>[0-9]+)", callbacks[1])
+        router.regex("[0-9a-z]+", callbacks[2])
+        router.prefix("?", callbacks[3])
+
+        # When
+        matches = list(router.match("42 is the answer"))
+
+        # Then
+        self.assertEqual([callback for callback, _ in matches], callbacks[1:3])
+        self.assertEqual(matches[0][1].group('number'), "42")
+        self.assertEqual(matches[0][1].string, "42 is the answer")
+
+    def test_uncombinable_routes(self):
+        # Given
+        router = Router()
+        first, second = Mock(), Mock()
+        router.regex("(?P<word>[a-z]+)", first)
+        router.regex("(?P<word>[0-9]+)", second)
+
+        # When
+        callbacks = [callback for callback, _ in router.match("42")]
+
+        # Then
+        self.assertEqual(callbacks, [second])
+
+    def test_backreference(self):
+        # Given
+        router = Router()
+        first, second = Mock(), Mock()
+        router.regex("(x)", first)
+        router.regex(r"(a)\1", second)
+
+        # When
+        callbacks = [callback for callback, _ in router.match("aa")]
+
+        # Then
+        self.assertEqual(callbacks, [second])
+
+    def test_conditional_group(self):
+        # Given
+        router = Router()
+        first, second = Mock(), Mock()
+        router.regex("(x)", first)
+        router.regex("(a)(?(1)b|c)", second)
+
+        # When
+        callbacks = [callback for callback, _ in router.match("ab")]
+
+        # Then
+        self.assertEqual(callbacks, [second])
+
+    def test_inline_flags(self):
+        # Given
+        router = Router()
+        first, second, third = Mock(), Mock(), Mock()
+        router.prefix("a", first)
+        router.regex("(?i)b", second)
+        router.prefix("c", third)
+
+        # When
+        upper = [callback for callback, _ in router.match("A")]
+        flagged = [callback for callback, _ in router.match("B")]
+        following = [callback for callback, _ in router.match("c")]
+
+        # Then
+        self.assertEqual(upper, [])
+        self.assertEqual(flagged, [second])
+        self.assertEqual(following, [third])